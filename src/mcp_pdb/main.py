@@ -1,4 +1,5 @@
 import atexit
+import functools
 import os
 import queue
 import re
@@ -15,6 +16,16 @@ import traceback
 
 from mcp.server.fastmcp import FastMCP
 
+# Platform-specific virtual environment layout; sys.platform never changes at runtime
+_IS_WINDOWS = sys.platform == "win32"
+_BIN_DIR_NAME = "Scripts" if _IS_WINDOWS else "bin"
+_PYTHON_EXE = "python.exe" if _IS_WINDOWS else "python"
+
+# Files/directories marking a project root, in reporting priority order
+_PROJECT_ROOT_INDICATORS = ("pyproject.toml", ".git", "setup.py", "requirements.txt", "Pipfile", "poetry.lock")
+# Directory names probed for a virtual environment, in priority order
+_VENV_NAMES = ('.venv', 'venv', 'env', '.env', 'virtualenv', '.virtualenv')
+
 # Initialize FastMCP server
 mcp = FastMCP("mcp-pdb")
 
@@ -297,35 +308,132 @@ def send_to_pdb(command, timeout_multiplier=1.0):
         return f"Unexpected error sending command: {e}"
 
 
-def find_project_root(start_path):
-    """Find the project root containing pyproject.toml, .git or other indicators, searching upwards."""
-    current_dir = os.path.abspath(start_path)
-    # Common project root indicators
-    root_indicators = ["pyproject.toml", ".git", "setup.py", "requirements.txt", "Pipfile", "poetry.lock"]
-
-    # Guard against infinite loop if start_path is already root
-    while current_dir and current_dir != os.path.dirname(current_dir):
-        for indicator in root_indicators:
-            if os.path.exists(os.path.join(current_dir, indicator)):
-                print(f"Found project root indicator '{indicator}' at: {current_dir}")
-                return current_dir
-        current_dir = os.path.dirname(current_dir)
+# Short-lived caches for find_project_root and find_venv_details, including
+# misses: {key: (timestamp, result)}.  Entries expire after PATH_CACHE_TTL so a
+# long-running server notices new projects and venvs (git init, uv init, ...).
+# Dicts are kept in insertion (i.e. timestamp) order, oldest first.
+_project_root_cache = {}
+_venv_cache = {}
+PATH_CACHE_TTL = 5.0  # Seconds before a cached lookup is re-checked
+PATH_CACHE_MAXSIZE = 256  # Entries kept per cache
+
+
+def _cache_get(cache, key, now):
+    """Return the (timestamp, result) entry for key if it has not expired, else None."""
+    cached = cache.get(key)
+    if cached is not None and now - cached[0] < PATH_CACHE_TTL:
+        return cached
+    return None
+
+
+def _cache_store(cache, key, now, result):
+    """Insert a lookup into cache, evicting expired and excess entries.
+
+    Re-inserting moves the key to the end, so the dict stays ordered by
+    timestamp and eviction only ever has to look at the front.
+    """
+    cache.pop(key, None)
+    while cache:
+        oldest_key = next(iter(cache))
+        stamp = cache[oldest_key][0]
+        if now - stamp < PATH_CACHE_TTL and len(cache) < PATH_CACHE_MAXSIZE:
+            break
+        del cache[oldest_key]
+    cache[key] = (now, result)
+
+
+def clear_project_root_cache():
+    """Forget all cached find_project_root results."""
+    _project_root_cache.clear()
+
+
+def clear_venv_cache():
+    """Forget all cached find_venv_details results."""
+    _venv_cache.clear()
+
+
+def _find_root_indicator(path):
+    """Return the highest-priority project root indicator in path, or None.
+
+    Probes each name directly: six stats are cheaper than listing any
+    non-trivial directory, and work for searchable but unreadable ones.
+    """
+    for indicator in _PROJECT_ROOT_INDICATORS:
+        if os.path.exists(os.path.join(path, indicator)):
+            return indicator
+    return None
+
+
+def _find_project_root_uncached(start_path):
+    """Walk upwards from an absolute start_path looking for project root indicators."""
+    current_dir = start_path
+
+    while current_dir:
+        parent_dir = os.path.dirname(current_dir)
+        # Guard against infinite loop once we reach the filesystem root
+        if parent_dir == current_dir:
+            break
+        indicator = _find_root_indicator(current_dir)
+        if indicator:
+            print(f"Found project root indicator '{indicator}' at: {current_dir}")
+            return current_dir
+        current_dir = parent_dir
 
     # Fallback to the starting path's directory if no indicator found
-    fallback_dir = os.path.abspath(start_path)
-    print(f"No common project root indicators found upwards. Falling back to: {fallback_dir}")
-    return fallback_dir
+    print(f"No common project root indicators found upwards. Falling back to: {start_path}")
+    return start_path
+
+
+def find_project_root(start_path):
+    """Find the project root containing pyproject.toml, .git or other indicators, searching upwards.
+
+    Results, including fallbacks, are cached per absolute start path for
+    PATH_CACHE_TTL seconds, so back-to-back launches from the same directory
+    skip the upward walk.
+    """
+    start_path = os.path.abspath(start_path)
+    now = time.monotonic()
+    cached = _cache_get(_project_root_cache, start_path, now)
+    if cached is not None:
+        return cached[1]
+
+    result = _find_project_root_uncached(start_path)
+    _cache_store(_project_root_cache, start_path, now, result)
+    return result
 
 
 def find_venv_details(project_root):
     """Check for virtual environment directories and return python path and bin dir.
 
+    Both hits and misses are cached for PATH_CACHE_TTL seconds, keyed on the
+    project root and the VIRTUAL_ENV/CONDA_PREFIX fallbacks, so back-to-back
+    launches of the same project do not repeat the filesystem probes.
+    """
+    # Read the VIRTUAL_ENV/CONDA_PREFIX fallbacks once and pass them to the scan,
+    # so the cache key matches the values actually probed.  PATH and HOME, used
+    # by the last-resort lookups, are not part of the key; changes to them are
+    # picked up once the entry expires.
+    virtual_env = os.environ.get('VIRTUAL_ENV')
+    conda_prefix = os.environ.get('CONDA_PREFIX')
+    key = (project_root, virtual_env, conda_prefix)
+    now = time.monotonic()
+    cached = _cache_get(_venv_cache, key, now)
+    if cached is not None:
+        return cached[1]
+
+    result = _find_venv_details_uncached(project_root, virtual_env, conda_prefix)
+    _cache_store(_venv_cache, key, now, result)
+    return result
+
+
+def _find_venv_details_uncached(project_root, virtual_env=None, conda_prefix=None):
+    """Scan the filesystem and the given VIRTUAL_ENV/CONDA_PREFIX values for a virtual environment.
+
     Note: We prioritize scanning for venv directories in the project root over
     environment variables (VIRTUAL_ENV, CONDA_PREFIX) because when mcp-pdb runs
     under uv or other tools, these environment variables point to mcp-pdb's own
     environment, not the debuggee's environment.
     """
-    common_venv_names = ['.venv', 'venv', 'env', '.env', 'virtualenv', '.virtualenv']
     common_venv_locations = [project_root]
 
     # Also check parent directory as some projects keep venvs one level up
@@ -337,80 +445,86 @@ def find_venv_details(project_root):
     # This takes priority over environment variables because VIRTUAL_ENV/CONDA_PREFIX
     # may point to mcp-pdb's own environment when running under uv
     for location in common_venv_locations:
-        for name in common_venv_names:
+        for name in _VENV_NAMES:
+            # Probe each candidate directly rather than listing the location:
+            # the parent is often a directory full of sibling projects.
             venv_path = os.path.join(location, name)
             if os.path.isdir(venv_path):
-                if sys.platform == "win32":
-                    python_exe = os.path.join(venv_path, 'Scripts', 'python.exe')
-                    bin_dir = os.path.join(venv_path, 'Scripts')
-                else:
-                    python_exe = os.path.join(venv_path, 'bin', 'python')
-                    bin_dir = os.path.join(venv_path, 'bin')
+                bin_dir = os.path.join(venv_path, _BIN_DIR_NAME)
+                python_exe = os.path.join(bin_dir, _PYTHON_EXE)
 
-                if os.path.exists(python_exe):
+                if os.path.isfile(python_exe):
                     print(f"Found virtual environment: {venv_path}")
                     return python_exe, bin_dir
 
     # Fallback: Check environment variables pointing to active virtual env
     # Note: These are checked AFTER scanning for project venv directories because
     # when running under uv, these may point to mcp-pdb's own environment
-    if 'VIRTUAL_ENV' in os.environ:
-        venv_path = os.environ['VIRTUAL_ENV']
-        if os.path.isdir(venv_path):
-            if sys.platform == "win32":
-                python_exe = os.path.join(venv_path, 'Scripts', 'python.exe')
-                bin_dir = os.path.join(venv_path, 'Scripts')
-            else:
-                python_exe = os.path.join(venv_path, 'bin', 'python')
-                bin_dir = os.path.join(venv_path, 'bin')
+    if virtual_env and os.path.isdir(virtual_env):
+        bin_dir = os.path.join(virtual_env, _BIN_DIR_NAME)
+        python_exe = os.path.join(bin_dir, _PYTHON_EXE)
 
-            if os.path.exists(python_exe):
-                print(f"Found active virtual environment from VIRTUAL_ENV: {venv_path}")
-                return python_exe, bin_dir
+        if os.path.exists(python_exe):
+            print(f"Found active virtual environment from VIRTUAL_ENV: {virtual_env}")
+            return python_exe, bin_dir
 
     # Check for conda environment (also as fallback)
-    if 'CONDA_PREFIX' in os.environ:
-        conda_path = os.environ['CONDA_PREFIX']
-        if sys.platform == "win32":
-            python_exe = os.path.join(conda_path, 'python.exe')
-            bin_dir = conda_path
-        else:
-            python_exe = os.path.join(conda_path, 'bin', 'python')
-            bin_dir = os.path.join(conda_path, 'bin')
+    if conda_prefix:
+        # Conda on Windows keeps python.exe in the environment root, not Scripts
+        bin_dir = conda_prefix if _IS_WINDOWS else os.path.join(conda_prefix, _BIN_DIR_NAME)
+        python_exe = os.path.join(bin_dir, _PYTHON_EXE)
 
         if os.path.exists(python_exe):
-            print(f"Found conda environment from CONDA_PREFIX: {conda_path}")
+            print(f"Found conda environment from CONDA_PREFIX: {conda_prefix}")
             return python_exe, bin_dir
 
     # Look for other common Python installations
-    if sys.platform == "win32":
-        for path in os.environ["PATH"].split(os.pathsep):
-            py_exe = os.path.join(path, "python.exe")
+    if _IS_WINDOWS:
+        for path in os.environ.get("PATH", "").split(os.pathsep):
+            py_exe = os.path.join(path, _PYTHON_EXE)
             if os.path.exists(py_exe):
                 return py_exe, path
     else:
         # On Unix, check if we have a user-installed Python in .local/bin
+        # scandir hands back the joined entry.path and cached file type, so
+        # there is no per-entry join or stat for names that don't match.
         local_bin = os.path.expanduser("~/.local/bin")
-        if os.path.exists(local_bin):
-            for f in os.listdir(local_bin):
-                if f.startswith("python") and os.path.isfile(os.path.join(local_bin, f)):
-                    py_exe = os.path.join(local_bin, f)
-                    return py_exe, local_bin
+        try:
+            with os.scandir(local_bin) as it:
+                for entry in it:
+                    if entry.name.startswith("python") and entry.is_file():
+                        return entry.path, local_bin
+        except OSError:
+            pass
 
     print(f"No virtual environment found in: {project_root}")
     return None, None
 
 
+# Shell metacharacters rejected by sanitize_arguments.  Multi-character
+# operators come first so '||' is reported as such rather than as '|'.
+_DANGEROUS_ARGS_RE = re.compile(r"&&|\|\||\$\(|[;`|<>]")
+
+
+@functools.lru_cache(maxsize=1024)
+def _tokenize_arguments(args_str):
+    """Split an argument string shell-style; memoized, so returns an immutable tuple."""
+    return tuple(shlex.split(args_str))
+
+
 def sanitize_arguments(args_str):
-    """Validate and sanitize command line arguments to prevent injection."""
-    dangerous_patterns = [';', '&&', '||', '`', '$(', '|', '>', '<']
-    for pattern in dangerous_patterns:
-        if pattern in args_str:
-            raise ValueError(f"Invalid character in arguments: {pattern}")
+    """Validate and sanitize command line arguments to prevent injection.
+
+    Validation runs on every call; only the shlex tokenization is cached.
+    """
+    match = _DANGEROUS_ARGS_RE.search(args_str)
+    if match:
+        raise ValueError(
+            f"Invalid character in arguments: {match.group(0)} (at position {match.start()})"
+        )
 
     try:
-        parsed_args = shlex.split(args_str)
-        return parsed_args
+        return list(_tokenize_arguments(args_str))
     except ValueError as e:
         raise ValueError(f"Error parsing arguments: {e}")
 
@@ -719,7 +833,7 @@ def start_debug(file_path: str, use_pytest: bool = False, args: str = "",
 
             if use_pytest:
                 # Find pytest within the venv
-                pytest_exe = os.path.join(venv_bin_dir, 'pytest' + ('.exe' if sys.platform == 'win32' else ''))
+                pytest_exe = os.path.join(venv_bin_dir, 'pytest' + ('.exe' if _IS_WINDOWS else ''))
                 if not os.path.exists(pytest_exe):
                     # Try finding via the venv python itself
                     try:
@@ -4,15 +4,14 @@ import os
 import queue
 import socket
 import sys
-import tempfile
 import threading
 import time  # noqa: F401 – used in test_emits_prompt_without_newline
-from pathlib import Path
-from unittest import mock
 
 import pytest
 
 from mcp_pdb.main import (
+    clear_project_root_cache,
+    clear_venv_cache,
     find_project_root,
     find_venv_details,
     get_pdb_output,
@@ -21,56 +20,63 @@ from mcp_pdb.main import (
 )
 
 
-class TestFindProjectRoot:
-    """Tests for find_project_root function."""
+def _touch(path) -> None:
+    """Create an empty file with a single open/close.
 
-    def test_finds_pyproject_toml(self, tmp_path):
-        """Should find project root when pyproject.toml exists."""
-        # Create nested directory structure
-        project_dir = tmp_path / "my_project"
-        project_dir.mkdir()
-        (project_dir / "pyproject.toml").touch()
+    Path.touch() first tries os.utime() on the path, which for a new file is
+    an extra failing syscall before the open.
+    """
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
 
-        src_dir = project_dir / "src" / "package"
-        src_dir.mkdir(parents=True)
 
-        result = find_project_root(str(src_dir))
-        assert result == str(project_dir)
+@pytest.fixture(autouse=True)
+def _cold_path_caches():
+    """Clear memoized path lookups so each test exercises the real walk."""
+    clear_project_root_cache()
+    clear_venv_cache()
+    yield
+    clear_project_root_cache()
+    clear_venv_cache()
 
-    def test_finds_git_directory(self, tmp_path):
-        """Should find project root when .git directory exists."""
-        project_dir = tmp_path / "my_project"
-        project_dir.mkdir()
-        (project_dir / ".git").mkdir()
-
-        nested_dir = project_dir / "src" / "deep" / "nested"
-        nested_dir.mkdir(parents=True)
 
-        result = find_project_root(str(nested_dir))
-        assert result == str(project_dir)
+class TestFindProjectRoot:
+    """Tests for find_project_root function."""
 
-    def test_finds_setup_py(self, tmp_path):
-        """Should find project root when setup.py exists."""
+    @pytest.mark.parametrize(
+        "indicator, is_dir",
+        [
+            ("pyproject.toml", False),
+            (".git", True),
+            ("setup.py", False),
+            ("requirements.txt", False),
+            ("Pipfile", False),
+            ("poetry.lock", False),
+        ],
+    )
+    def test_finds_indicator(self, tmp_path, indicator, is_dir):
+        """Should find project root when any root indicator exists above the start path."""
         project_dir = tmp_path / "my_project"
         project_dir.mkdir()
-        (project_dir / "setup.py").touch()
+        if is_dir:
+            (project_dir / indicator).mkdir()
+        else:
+            _touch(project_dir / indicator)
 
-        src_dir = project_dir / "src"
-        src_dir.mkdir()
+        nested_dir = project_dir / "src" / "package"
+        nested_dir.mkdir(parents=True)
 
-        result = find_project_root(str(src_dir))
+        result = find_project_root(str(nested_dir))
         assert result == str(project_dir)
 
-    def test_finds_requirements_txt(self, tmp_path):
-        """Should find project root when requirements.txt exists."""
-        project_dir = tmp_path / "my_project"
-        project_dir.mkdir()
-        (project_dir / "requirements.txt").touch()
-
-        src_dir = project_dir / "src"
-        src_dir.mkdir()
+    def test_start_path_is_project_root(self, tmp_path):
+        """Should return the start path itself when it holds an indicator."""
+        outer_project = tmp_path / "outer"
+        project_dir = outer_project / "project"
+        project_dir.mkdir(parents=True)
+        (outer_project / ".git").mkdir()
+        _touch(project_dir / "pyproject.toml")
 
-        result = find_project_root(str(src_dir))
+        result = find_project_root(str(project_dir))
         assert result == str(project_dir)
 
     def test_fallback_to_start_path(self, tmp_path):
@@ -82,16 +88,34 @@ class TestFindProjectRoot:
         result = find_project_root(str(empty_dir))
         assert result == str(empty_dir)
 
+    def test_crosses_nested_mount_point(self, tmp_path, monkeypatch):
+        """A mount inside a project (e.g. a Docker volume) must not hide its root."""
+        outer_project = tmp_path / "outer"
+        outer_project.mkdir()
+        _touch(outer_project / "pyproject.toml")
+
+        mount_dir = outer_project / "mnt"
+        start_dir = mount_dir / "data"
+        start_dir.mkdir(parents=True)
+
+        real_ismount = os.path.ismount
+        monkeypatch.setattr(
+            os.path, "ismount", lambda p: p == str(mount_dir) or real_ismount(p)
+        )
+
+        result = find_project_root(str(start_dir))
+        assert result == str(outer_project)
+
     def test_prefers_closest_indicator(self, tmp_path):
         """Should find the closest project root when multiple exist."""
         # Create nested projects
         outer_project = tmp_path / "outer"
         outer_project.mkdir()
-        (outer_project / "pyproject.toml").touch()
+        _touch(outer_project / "pyproject.toml")
 
         inner_project = outer_project / "inner"
         inner_project.mkdir()
-        (inner_project / "pyproject.toml").touch()
+        _touch(inner_project / "pyproject.toml")
 
         src_dir = inner_project / "src"
         src_dir.mkdir()
@@ -99,91 +123,107 @@ class TestFindProjectRoot:
         result = find_project_root(str(src_dir))
         assert result == str(inner_project)
 
+    def test_caches_by_absolute_path_until_ttl_expires(self, tmp_path, monkeypatch):
+        """Relative and absolute spellings share a cache entry, which expires."""
+        m = sys.modules["mcp_pdb.main"]
+        project_dir = tmp_path / "my_project"
+        project_dir.mkdir()
+        _touch(project_dir / "pyproject.toml")
+        src_dir = project_dir / "src"
+        src_dir.mkdir()
+
+        assert find_project_root(str(src_dir)) == str(project_dir)
+
+        # Within the TTL the cached result is reused, even via a relative path...
+        (project_dir / "pyproject.toml").unlink()
+        monkeypatch.chdir(project_dir)
+        assert find_project_root("src") == str(project_dir)
+
+        # ...and the change is picked up once the entry has expired.
+        monkeypatch.setattr(m, "PATH_CACHE_TTL", 0.0)
+        assert find_project_root(str(src_dir)) == str(src_dir)
+
+
+# Layout find_venv_details probes for inside a venv directory
+BIN_DIR_NAME = "Scripts" if sys.platform == "win32" else "bin"
+PYTHON_NAME = "python.exe" if sys.platform == "win32" else "python"
+
+
+@pytest.fixture(scope="session")
+def python_stub(tmp_path_factory):
+    """A single empty file that every fake venv interpreter is hard-linked to."""
+    stub = tmp_path_factory.mktemp("seed") / PYTHON_NAME
+    _touch(stub)
+    return stub
+
+
+@pytest.fixture
+def make_venv(python_stub):
+    """Return a callable that builds a minimal venv under a parent directory.
+
+    ``make_venv(parent, name=".venv")`` creates ``parent/name/<bin>/<python>``
+    (creating ``parent`` as needed) and returns the bin directory, replacing
+    the mkdir/touch boilerplate each venv test would otherwise repeat.  The
+    interpreter is a hard link to ``python_stub`` (one link() call instead of
+    creating a file), falling back to _touch() where links are not supported.
+    """
+    def _make(parent, name=".venv"):
+        bin_dir = parent / name / BIN_DIR_NAME
+        bin_dir.mkdir(parents=True)
+        try:
+            os.link(python_stub, bin_dir / PYTHON_NAME)
+        except OSError:
+            _touch(bin_dir / PYTHON_NAME)
+        return bin_dir
+
+    return _make
+
 
 class TestFindVenvDetails:
     """Tests for find_venv_details function."""
 
-    def test_finds_venv_in_project_root(self, tmp_path):
+    def test_finds_venv_in_project_root(self, tmp_path, make_venv):
         """Should find .venv directory in project root."""
         project_dir = tmp_path / "project"
-        project_dir.mkdir()
-
-        # Create venv structure
-        venv_dir = project_dir / ".venv"
-        if sys.platform == "win32":
-            bin_dir = venv_dir / "Scripts"
-            python_name = "python.exe"
-        else:
-            bin_dir = venv_dir / "bin"
-            python_name = "python"
-
-        bin_dir.mkdir(parents=True)
-        (bin_dir / python_name).touch()
+        bin_dir = make_venv(project_dir)
 
         python_exe, found_bin_dir = find_venv_details(str(project_dir))
 
-        assert python_exe == str(bin_dir / python_name)
+        assert python_exe == str(bin_dir / PYTHON_NAME)
         assert found_bin_dir == str(bin_dir)
 
-    def test_finds_venv_named_venv(self, tmp_path):
+    def test_finds_venv_named_venv(self, tmp_path, make_venv):
         """Should find venv directory named 'venv'."""
         project_dir = tmp_path / "project"
-        project_dir.mkdir()
-
-        venv_dir = project_dir / "venv"
-        if sys.platform == "win32":
-            bin_dir = venv_dir / "Scripts"
-            python_name = "python.exe"
-        else:
-            bin_dir = venv_dir / "bin"
-            python_name = "python"
-
-        bin_dir.mkdir(parents=True)
-        (bin_dir / python_name).touch()
+        bin_dir = make_venv(project_dir, "venv")
 
         python_exe, found_bin_dir = find_venv_details(str(project_dir))
 
-        assert python_exe == str(bin_dir / python_name)
+        assert python_exe == str(bin_dir / PYTHON_NAME)
         assert found_bin_dir == str(bin_dir)
 
-    def test_prefers_project_venv_over_virtual_env_variable(self, tmp_path):
+    def test_prefers_project_venv_over_virtual_env_variable(self, tmp_path, monkeypatch, make_venv):
         """Should prefer project's .venv over VIRTUAL_ENV environment variable.
 
         This is the key fix for issue #3 - when mcp-pdb runs under uv,
         VIRTUAL_ENV points to mcp-pdb's own environment, not the debuggee's.
         """
         project_dir = tmp_path / "project"
-        project_dir.mkdir()
-
-        # Create project's venv
-        project_venv = project_dir / ".venv"
-        if sys.platform == "win32":
-            project_bin = project_venv / "Scripts"
-            python_name = "python.exe"
-        else:
-            project_bin = project_venv / "bin"
-            python_name = "python"
-        project_bin.mkdir(parents=True)
-        (project_bin / python_name).touch()
+        project_bin = make_venv(project_dir)
 
         # Create a different venv that VIRTUAL_ENV points to (simulating uv's env)
         other_venv = tmp_path / "uv_env"
-        if sys.platform == "win32":
-            other_bin = other_venv / "Scripts"
-        else:
-            other_bin = other_venv / "bin"
-        other_bin.mkdir(parents=True)
-        (other_bin / python_name).touch()
+        make_venv(tmp_path, "uv_env")
 
         # Set VIRTUAL_ENV to the other venv
-        with mock.patch.dict(os.environ, {"VIRTUAL_ENV": str(other_venv)}):
-            python_exe, found_bin_dir = find_venv_details(str(project_dir))
+        monkeypatch.setenv("VIRTUAL_ENV", str(other_venv))
+        python_exe, found_bin_dir = find_venv_details(str(project_dir))
 
         # Should find the project's venv, not the one from VIRTUAL_ENV
-        assert python_exe == str(project_bin / python_name)
+        assert python_exe == str(project_bin / PYTHON_NAME)
         assert found_bin_dir == str(project_bin)
 
-    def test_falls_back_to_virtual_env_when_no_local_venv(self, tmp_path):
+    def test_falls_back_to_virtual_env_when_no_local_venv(self, tmp_path, monkeypatch, make_venv):
         """Should fall back to VIRTUAL_ENV when no local venv exists."""
         project_dir = tmp_path / "project"
         project_dir.mkdir()
@@ -191,41 +231,20 @@ class TestFindVenvDetails:
 
         # Create venv that VIRTUAL_ENV points to
         env_venv = tmp_path / "some_env"
-        if sys.platform == "win32":
-            env_bin = env_venv / "Scripts"
-            python_name = "python.exe"
-        else:
-            env_bin = env_venv / "bin"
-            python_name = "python"
-        env_bin.mkdir(parents=True)
-        (env_bin / python_name).touch()
-
-        with mock.patch.dict(os.environ, {"VIRTUAL_ENV": str(env_venv)}, clear=False):
-            # Also need to clear CONDA_PREFIX to avoid interference
-            env_copy = os.environ.copy()
-            env_copy["VIRTUAL_ENV"] = str(env_venv)
-            env_copy.pop("CONDA_PREFIX", None)
-            with mock.patch.dict(os.environ, env_copy, clear=True):
-                python_exe, found_bin_dir = find_venv_details(str(project_dir))
-
-        assert python_exe == str(env_bin / python_name)
+        env_bin = make_venv(tmp_path, "some_env")
+
+        monkeypatch.setenv("VIRTUAL_ENV", str(env_venv))
+        # Also need to clear CONDA_PREFIX to avoid interference
+        monkeypatch.delenv("CONDA_PREFIX", raising=False)
+        python_exe, found_bin_dir = find_venv_details(str(project_dir))
+
+        assert python_exe == str(env_bin / PYTHON_NAME)
         assert found_bin_dir == str(env_bin)
 
-    def test_finds_venv_in_parent_directory(self, tmp_path):
+    def test_finds_venv_in_parent_directory(self, tmp_path, make_venv):
         """Should find venv in parent directory."""
         parent_dir = tmp_path / "parent"
-        parent_dir.mkdir()
-
-        # Create venv in parent
-        venv_dir = parent_dir / ".venv"
-        if sys.platform == "win32":
-            bin_dir = venv_dir / "Scripts"
-            python_name = "python.exe"
-        else:
-            bin_dir = venv_dir / "bin"
-            python_name = "python"
-        bin_dir.mkdir(parents=True)
-        (bin_dir / python_name).touch()
+        bin_dir = make_venv(parent_dir)
 
         # Project is a subdirectory
         project_dir = parent_dir / "project"
@@ -233,52 +252,97 @@ class TestFindVenvDetails:
 
         python_exe, found_bin_dir = find_venv_details(str(project_dir))
 
-        assert python_exe == str(bin_dir / python_name)
+        assert python_exe == str(bin_dir / PYTHON_NAME)
         assert found_bin_dir == str(bin_dir)
 
-    def test_returns_none_when_no_venv_found(self, tmp_path):
+    def test_returns_none_when_no_venv_found(self, tmp_path, monkeypatch):
         """Should return None, None when no venv is found."""
         project_dir = tmp_path / "project"
         project_dir.mkdir()
 
-        # Clear environment variables that might point to venvs
-        with mock.patch.dict(os.environ, {}, clear=True):
-            # Restore PATH for the test to work
-            with mock.patch.dict(os.environ, {"PATH": ""}, clear=True):
-                python_exe, bin_dir = find_venv_details(str(project_dir))
+        # Clear environment variables that might point to venvs, and point
+        # HOME somewhere without a ~/.local/bin python
+        monkeypatch.delenv("VIRTUAL_ENV", raising=False)
+        monkeypatch.delenv("CONDA_PREFIX", raising=False)
+        monkeypatch.setenv("PATH", "")
+        monkeypatch.setenv("HOME", str(tmp_path))
+        python_exe, bin_dir = find_venv_details(str(project_dir))
 
         assert python_exe is None
         assert bin_dir is None
 
-    def test_prefers_dotenv_over_env(self, tmp_path):
+    def test_prefers_dotenv_over_env(self, tmp_path, make_venv):
         """Should check .venv before venv (order matters)."""
         project_dir = tmp_path / "project"
-        project_dir.mkdir()
 
         # Create both .venv and venv
-        for name in [".venv", "venv"]:
-            venv_dir = project_dir / name
-            if sys.platform == "win32":
-                bin_dir = venv_dir / "Scripts"
-                python_name = "python.exe"
-            else:
-                bin_dir = venv_dir / "bin"
-                python_name = "python"
-            bin_dir.mkdir(parents=True)
-            (bin_dir / python_name).touch()
+        expected_bin = make_venv(project_dir, ".venv")
+        make_venv(project_dir, "venv")
 
         python_exe, found_bin_dir = find_venv_details(str(project_dir))
 
         # Should find .venv first (it's first in the list)
-        expected_venv = project_dir / ".venv"
-        if sys.platform == "win32":
-            expected_bin = expected_venv / "Scripts"
-            python_name = "python.exe"
-        else:
-            expected_bin = expected_venv / "bin"
-            python_name = "python"
+        assert python_exe == str(expected_bin / PYTHON_NAME)
 
-        assert python_exe == str(expected_bin / python_name)
+    def test_skips_dotenv_file_named_like_venv(self, tmp_path, make_venv):
+        """A plain '.env' file must not be mistaken for a venv directory."""
+        project_dir = tmp_path / "project"
+        project_dir.mkdir()
+        (project_dir / ".env").write_text("SECRET=1\n")
+        bin_dir = make_venv(project_dir, "venv")
+
+        python_exe, found_bin_dir = find_venv_details(str(project_dir))
+
+        assert python_exe == str(bin_dir / PYTHON_NAME)
+        assert found_bin_dir == str(bin_dir)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges on Windows")
+    def test_skips_looping_venv_symlink(self, tmp_path, make_venv):
+        """A self-referencing '.venv' symlink should be skipped, not raise."""
+        project_dir = tmp_path / "project"
+        project_dir.mkdir()
+        os.symlink(".venv", project_dir / ".venv")
+        bin_dir = make_venv(project_dir, "venv")
+
+        python_exe, found_bin_dir = find_venv_details(str(project_dir))
+
+        assert python_exe == str(bin_dir / PYTHON_NAME)
+        assert found_bin_dir == str(bin_dir)
+
+    def test_caches_result_until_ttl_expires(self, tmp_path, monkeypatch, make_venv):
+        """A repeat lookup within the TTL should not rescan the filesystem."""
+        m = sys.modules["mcp_pdb.main"]
+        project_dir = tmp_path / "project"
+        project_dir.mkdir()
+
+        first = find_venv_details(str(project_dir))
+
+        # A venv created after the first lookup is invisible while cached...
+        bin_dir = make_venv(project_dir)
+        assert find_venv_details(str(project_dir)) == first
+
+        # ...and picked up once the entry has expired.
+        monkeypatch.setattr(m, "PATH_CACHE_TTL", 0.0)
+        assert find_venv_details(str(project_dir)) == (str(bin_dir / PYTHON_NAME), str(bin_dir))
+
+    def test_cache_evicts_expired_and_excess_entries(self, tmp_path, monkeypatch):
+        """The venv cache should stay bounded for a long-running server."""
+        m = sys.modules["mcp_pdb.main"]
+        monkeypatch.setattr(m, "PATH_CACHE_MAXSIZE", 3)
+        roots = []
+        for i in range(5):
+            root = tmp_path / f"project{i}"
+            root.mkdir()
+            roots.append(str(root))
+            find_venv_details(str(root))
+
+        # Only the most recent PATH_CACHE_MAXSIZE lookups are kept
+        assert [key[0] for key in m._venv_cache] == roots[-3:]
+
+        # Once entries expire, the next insert drops all of them
+        monkeypatch.setattr(m, "PATH_CACHE_TTL", 0.0)
+        find_venv_details(roots[0])
+        assert [key[0] for key in m._venv_cache] == [roots[0]]
 
 
 class TestSanitizeArguments:
@@ -339,11 +403,22 @@ class TestSanitizeArguments:
         with pytest.raises(ValueError, match="Invalid character"):
             sanitize_arguments("arg < /etc/passwd")
 
+    def test_error_pinpoints_first_offender(self):
+        """The error should name the first offending operator and its position."""
+        with pytest.raises(ValueError, match=r"Invalid character in arguments: \|\| \(at position 5\)"):
+            sanitize_arguments("arg1 || fallback > out")
+
     def test_parses_complex_valid_arguments(self):
         """Should parse complex but valid arguments."""
         result = sanitize_arguments('--config /path/to/config.json --verbose -n 5')
         assert result == ["--config", "/path/to/config.json", "--verbose", "-n", "5"]
 
+    def test_returns_independent_lists(self):
+        """Mutating one result must not leak into the next call for the same string."""
+        first = sanitize_arguments("--flag value")
+        first.append("--injected")
+        assert sanitize_arguments("--flag value") == ["--flag", "value"]
+
     def test_handles_equals_in_arguments(self):
         """Should handle arguments with equals signs."""
         result = sanitize_arguments("--key=value --other=123")